@@ -3,8 +3,18 @@ from __future__ import print_function
 import inflection
 import copy
 import json
-import requests
 import pprint
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 from .exceptions import (
     AuthenticationFailed,
     BadRequest,
@@ -12,9 +22,105 @@ from .exceptions import (
     Unauthorized
 )
 from .resource import DRESTResource
+from six import string_types
 from six.moves.urllib.parse import urlencode
 
 
+_STATUS_EXCEPTIONS = {
+    401: AuthenticationFailed,
+    403: Unauthorized,
+    404: DoesNotExist,
+}
+
+_parsers = threading.local()
+
+# runs of 19+ digits may be integers outside 64 bits, which simdjson
+# rejects and orjson silently turns into floats; json keeps them exact
+_LONG_DIGITS = re.compile('[0-9]{19,}')
+_LONG_DIGITS_BYTES = re.compile(b'[0-9]{19,}')
+
+
+def _loads(content):
+    if _json is not json or simdjson is not None:
+        long_digits = (
+            _LONG_DIGITS_BYTES if isinstance(content, bytes)
+            else _LONG_DIGITS
+        )
+        if long_digits.search(content):
+            return json.loads(content)
+
+    if simdjson is not None:
+        # simdjson parsers reuse their internal buffers between documents,
+        # so keep one per thread rather than allocating one per response
+        parser = getattr(_parsers, 'parser', None)
+        if parser is None:
+            parser = _parsers.parser = simdjson.Parser()
+        try:
+            return parser.parse(content, True)
+        except (ValueError, RuntimeError):
+            # simdjson rejects some valid documents, such as integers
+            # outside 64 bits; let the fallback parser decide
+            pass
+    return _json.loads(content)
+
+
+def _dumps(data):
+    # pre-encoded bodies are sent as-is; orjson returns bytes, which
+    # the HTTP client forwards without encoding again
+    if isinstance(data, (bytes, string_types)):
+        return data
+    if _json is json:
+        return json.dumps(data)
+    try:
+        # json turns non-str keys into strings; orjson must be told to
+        return _json.dumps(data, option=_json.OPT_NON_STR_KEYS)
+    except TypeError:
+        # e.g. integers outside 64 bits, which only json can encode
+        return json.dumps(data)
+
+
+def _flatten_params(params):
+    # aiohttp does not expand list values into repeated keys, or drop
+    # None values, the way requests does
+    if not params:
+        return params
+    flattened = []
+    for key, values in params.items():
+        if isinstance(values, string_types) or not isinstance(
+            values, (list, tuple)
+        ):
+            values = [values]
+        for value in values:
+            if value is None:
+                continue
+            if not isinstance(value, string_types):
+                value = str(value)
+            flattened.append((key, value))
+    return flattened
+
+
+async def _close_with_loop(session):
+    # started once per session we create: asyncio.run finalizes pending
+    # async generators (loop.shutdown_asyncgens) before closing its loop,
+    # so the session is closed on its own loop even without aclose()
+    try:
+        yield
+    finally:
+        await session.close()
+
+
+def _encode(header):
+    # HTTP header values are latin-1; encoding once when credentials change
+    # saves the HTTP client from encoding them again on every request
+    return header.encode('latin-1')
+
+
+def _decode(content, encoding='utf-8'):
+    if isinstance(content, bytes):
+        return content.decode(encoding, 'replace')
+    return content
+
+
 class DRESTClient(object):
     """DREST Python client.
 
@@ -25,6 +131,9 @@ class DRESTClient(object):
         host: hostname to a DREST API
         version: version (defaults to no version)
         client: HTTP client (defaults to requests.session)
+        aclient: async HTTP client used by the async methods
+            (defaults to aiohttp.ClientSession, created on first use
+            in each event loop and closed with that loop)
         scheme: defaults to https
         authentication: if unset, authentication is disabled.
             If set, provides a dictionary of credentials: {
@@ -56,6 +165,12 @@ class DRESTClient(object):
             Would cause the client to short-circuit the API backend whenever
             "users" are requested, returning only the two users specified.
         verbose: if set, prints requests and responses to the command line
+        pool_size: number of connections kept alive per host
+            when the default client is used (defaults to 32)
+        workers: if set above 1, the remaining pages of a query are
+            fetched concurrently by up to this many threads once the
+            first page is loaded. The client must be thread-safe,
+            and workers should not exceed pool_size.
 
     Examples:
 
@@ -108,7 +223,39 @@ class DRESTClient(object):
     Creating records:
 
         user = client.Users.create(name='john')
+
+    Fetching records asynchronously:
+
+        async with client:
+            user = await client.Users.aget('123')
+            users = await client.Users.aall()
+
+    The client can also be closed explicitly with `await client.aclose()`.
     """
+    __slots__ = (
+        '_aclient',
+        '_aclient_closer',
+        '_aclient_loop',
+        '_authenticated',
+        '_authentication',
+        '_base_url',
+        '_client',
+        '_cookie',
+        '_cookie_name',
+        '_executor',
+        '_host',
+        '_login_endpoint',
+        '_mocks',
+        '_prefix',
+        '_resources',
+        '_scheme',
+        '_token',
+        '_token_type',
+        '_verbose',
+        '_version',
+        '_workers',
+    )
+
     def __init__(
         self,
         host,
@@ -117,11 +264,19 @@ class DRESTClient(object):
         scheme='https',
         authentication=None,
         mocks=None,
-        verbose=False
+        verbose=False,
+        pool_size=32,
+        aclient=None,
+        workers=1
     ):
         self._host = host
         self._version = version
-        self._client = client or requests.session()
+        self._client = client or self._create_client(pool_size)
+        self._aclient = aclient
+        self._aclient_closer = None
+        self._aclient_loop = None
+        self._workers = workers
+        self._executor = None
         self._client.headers.update({
             'Content-Type': 'application/json',
             'Accept': 'application/json'
@@ -131,6 +286,9 @@ class DRESTClient(object):
         if mocks:
             self._mocks = copy.deepcopy(mocks)
         self._scheme = scheme
+        # scheme, host and version are fixed, so build the URL root once
+        self._base_url = f'{scheme}://{host}'
+        self._prefix = '/' + version.lstrip('/') if version else ''
         self._verbose = verbose
         self._authenticated = True
         authentication = authentication or {}
@@ -164,30 +322,39 @@ class DRESTClient(object):
         return self._mocks
 
     def __repr__(self):
-        return '%s%s' % (
-            self._host,
-            '/%s/' % self._version if self._version else ''
-        )
+        if self._version:
+            return f'{self._host}/{self._version}/'
+        return self._host
 
     def _use_token(self, value):
         self._token = value
         self._authenticated = bool(value)
         self._client.headers.update({
-            'Authorization': '%s %s' % (
-                self._token_type, self._token if value else ''
-            )
+            'Authorization': _encode(f"{self._token_type} {value or ''}")
         })
 
     def _use_cookie(self, value):
         self._cookie = value
         self._authenticated = bool(value)
         self._client.headers.update({
-            'Cookie': '%s=%s' % (self._cookie_name, value)
+            'Cookie': _encode(f'{self._cookie_name}={value}')
         })
 
     def __getattr__(self, key):
-        key = inflection.underscore(key)
-        return self._resources.get(key, DRESTResource(self, key))
+        if key.startswith('_'):
+            # private and special attributes are never resources
+            raise AttributeError(key)
+        resources = self._resources
+        resource = resources.get(key)
+        if resource is None:
+            # cache under both spellings so that repeated access
+            # skips normalizing the name
+            name = inflection.underscore(key)
+            resource = resources.get(name)
+            if resource is None:
+                resource = resources[name] = DRESTResource(self, name)
+            resources[key] = resource
+        return resource
 
     def _login(self, raise_exception=True):
         username = self._authentication.get('username')
@@ -198,12 +365,15 @@ class DRESTClient(object):
             else:
                 return
 
-        response = requests.post(
+        response = self._client.post(
             self._build_url(self._login_endpoint),
             data={
                 'login': username,
                 'password': password
             },
+            # drop the session's JSON content type so that requests
+            # labels the form-encoded body itself
+            headers={'Content-Type': None},
             allow_redirects=False
         )
         if raise_exception:
@@ -218,20 +388,62 @@ class DRESTClient(object):
             raise AuthenticationFailed('DRest client failed to authenticate')
         return self._authenticated
 
-    def _build_url(self, url, prefix=None):
-        if not url.startswith('/'):
-            url = '/%s' % url
-
+    def _build_url(self, url, prefix=False):
+        url = '/' + url.lstrip('/')
         if prefix:
-            if not prefix.startswith('/'):
-                prefix = '/%s' % prefix
-
-            url = '%s%s' % (prefix, url)
-        return '%s://%s%s' % (self._scheme, self._host, url)
-
-    def request(self, method, url, params=None, data=None):
-        self._authenticate()
-        url = self._build_url(url, prefix=self._version)
+            url = self._prefix + url
+        return self._base_url + url
+
+    def _create_client(self, pool_size):
+        # requests (and urllib3) are imported on demand so that clients
+        # given their own session, or only using mocks, don't load them
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        client = requests.session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, backoff_factor=0.1)
+        )
+        client.mount('https://', adapter)
+        client.mount('http://', adapter)
+        return client
+
+    async def _get_aclient(self):
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if self._aclient_loop is not None and self._aclient_loop is not loop:
+            # sessions we create are bound to the loop they were created on,
+            # which is closed once e.g. an earlier asyncio.run returns
+            self._aclient = self._aclient_closer = self._aclient_loop = None
+        if self._aclient is None:
+            import aiohttp
+            self._aclient = aiohttp.ClientSession()
+            self._aclient_loop = loop
+            self._aclient_closer = _close_with_loop(self._aclient)
+            await self._aclient_closer.__anext__()
+        return self._aclient
+
+    async def aclose(self):
+        """Closes the async HTTP client, if one was created."""
+        closer = self._aclient_closer
+        aclient = self._aclient
+        self._aclient = self._aclient_closer = self._aclient_loop = None
+        if closer is not None:
+            await closer.aclose()
+        elif aclient is not None:
+            await aclient.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    def _prepare_request(self, method, url, params=None, data=None):
+        url = self._build_url(url, prefix=True)
         if self._verbose:
             print('-> %s %s%s' % (
                 method.upper(),
@@ -240,35 +452,93 @@ class DRESTClient(object):
             ))
             if data:
                 pprint.pprint(data)
+        return url, _dumps(data) if data else None
 
-        response = self._client.request(
-            method,
-            url,
-            params=params,
-            data=json.dumps(data) if data else None
-        )
-
-        content = response.content.decode('utf-8')
-        status = response.status_code
+    def _handle_response(self, content, status):
         try:
-            decoded = json.loads(content)
-        except:
+            decoded = _loads(content)
+        except ValueError:
+            content = _decode(content)
             decoded = content
 
         if self._verbose:
             print('<- (%d)' % status)
             pprint.pprint(decoded)
 
-        if status == 401:
-            raise AuthenticationFailed(content)
-
-        if status == 404:
-            raise DoesNotExist(content)
-
-        if status == 403:
-            raise Unauthorized(content)
-
         if status >= 400:
-            raise BadRequest(content)
+            raise _STATUS_EXCEPTIONS.get(status, BadRequest)(_decode(content))
 
         return decoded
+
+    def request(self, method, url, params=None, data=None, stream=False):
+        """Performs a request and returns the decoded response.
+
+        With stream set, a successful response is not read or decoded;
+        its body is returned as a file-like object for the caller
+        to parse incrementally and close.
+        """
+        if not self._authenticated:
+            self._authenticate()
+        url, data = self._prepare_request(method, url, params, data)
+        if stream:
+            response = self._client.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                stream=True
+            )
+            if response.status_code < 400:
+                # let urllib3 undo any gzip/deflate content encoding
+                response.raw.decode_content = True
+                return response.raw
+        else:
+            response = self._client.request(
+                method,
+                url,
+                params=params,
+                data=data
+            )
+        return self._handle_response(response.content, response.status_code)
+
+    def _parallel_get(self, url, params_list):
+        """Performs a GET request for each set of params.
+
+        Requests run concurrently on the client's thread pool.
+        Responses are returned in the same order as params_list.
+        """
+        if self._workers <= 1 or len(params_list) <= 1:
+            return [
+                self.request('get', url, params=params)
+                for params in params_list
+            ]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        return list(self._executor.map(
+            lambda params: self.request('get', url, params=params),
+            params_list
+        ))
+
+    async def arequest(self, method, url, params=None, data=None):
+        """Async version of request, backed by aiohttp.
+
+        Shares headers (and therefore credentials) with the sync client.
+        Username/password login is still performed synchronously.
+        """
+        if not self._authenticated:
+            self._authenticate()
+        url, data = self._prepare_request(method, url, params, data)
+        aclient = await self._get_aclient()
+        async with aclient.request(
+            method,
+            url,
+            params=_flatten_params(params),
+            data=data,
+            headers={
+                key: _decode(value, 'latin-1')
+                for key, value in self._client.headers.items()
+            }
+        ) as response:
+            content = await response.read()
+            status = response.status
+        return self._handle_response(content, status)
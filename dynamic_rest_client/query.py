@@ -1,6 +1,6 @@
 from __future__ import absolute_import
 from copy import copy
-from .utils import unpack
+from .utils import unpack, unpack_stream
 from six import string_types
 
 
@@ -44,6 +44,41 @@ class DRESTQuery(object):
         l = self.list()
         return l[-1] if l else None
 
+    def stream(self):
+        """Iterates over all records, parsing each page as it downloads.
+
+        Records are yielded before their page has been fully read,
+        without holding the page in memory. Requires ijson; without it,
+        this is the same as iterating over the query.
+        """
+        try:
+            import ijson  # noqa
+        except ImportError:
+            for record in self:
+                yield record
+            return
+
+        resource = self.resource
+        params = self._get_params()
+        page = pages = 1
+        while page <= pages:
+            params['page'] = page
+            body = resource.request('get', params=params, stream=True)
+            if isinstance(body, dict):
+                # mocks are returned already decoded
+                for record in self._load(body):
+                    yield record
+                return
+
+            meta = {}
+            try:
+                for data in unpack_stream(body, meta):
+                    yield resource.load(data)
+            finally:
+                body.close()
+            pages = meta.get('total_pages', 1)
+            page += 1
+
     def map(self, field='id'):
         return dict((
             (getattr(k, field), k) for k in self.list()
@@ -59,6 +94,36 @@ class DRESTQuery(object):
         response = resource.request('get', id=id, params=self._get_params())
         return self._load(response)
 
+    async def aget(self, id):
+        """Async version of get."""
+        resource = self.resource
+        response = await resource.arequest(
+            'get', id=id, params=self._get_params()
+        )
+        return self._load(response)
+
+    async def aall(self):
+        """Returns a list of all records, fetching pages concurrently."""
+        # imported here to keep asyncio out of the package's import time
+        import asyncio
+
+        resource = self.resource
+        params = self._get_params()
+        params['page'] = 1
+        data = await resource.arequest('get', params=params)
+        pages = data.get('meta', {}).get('total_pages', 1)
+        responses = [data]
+        if pages > 1:
+            responses.extend(await asyncio.gather(*(
+                resource.arequest('get', params=dict(params, page=page))
+                for page in range(2, pages + 1)
+            )))
+
+        records = []
+        for response in responses:
+            records.extend(self._load(response))
+        return records
+
     def filter(self, **kwargs):
         return self._copy(filters=kwargs)
 
@@ -115,6 +180,8 @@ class DRESTQuery(object):
         self._page = None
         # total number of pages
         self._pages = None
+        # responses for upcoming pages, when fetched concurrently
+        self._prefetched = None
 
     def _copy(self, **kwargs):
         data = self.__dict__
@@ -145,13 +212,23 @@ class DRESTQuery(object):
             self._page += 1
 
         resource = self.resource
-        params['page'] = self._page
-        data = resource.request('get', params=params)
-        meta = data.get('meta', {})
-        pages = meta.get('total_pages', 1)
+        if self._prefetched:
+            data = self._prefetched.pop(0)
+        else:
+            params['page'] = self._page
+            data = resource.request('get', params=params)
+            meta = data.get('meta', {})
+            self._pages = meta.get('total_pages', 1)
+            if (
+                self._page == 1 and
+                self._pages > 1 and
+                resource._client._workers > 1
+            ):
+                self._prefetched = resource.request_pages(
+                    range(2, self._pages + 1), params
+                )
 
         self._data = self._load(data)
-        self._pages = pages
         self._index = 0
 
     def _load(self, data):
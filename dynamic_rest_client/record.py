@@ -106,7 +106,9 @@ class DRESTRecord(object):
         for key, value in data.items():
             setattr(self, key, value)
 
-        self._clean = copy.deepcopy(self)
+        # snapshot for diffing on save; this is what __deepcopy__ returns,
+        # without going through copy.deepcopy's dispatch and memo
+        self._clean = self._get_data()
         self.id = data.get('_meta', {}).get('id', data.get('id', None))
 
     def _serialize(self, data):
@@ -22,7 +22,7 @@ class DRESTResource(object):
     def __call__(self, **kwargs):
         return DRESTRecord(resource=self, **kwargs)
 
-    def request(self, method, id=None, params=None, data=None):
+    def request(self, method, id=None, params=None, data=None, stream=False):
         """Perform a request against this resource.
 
         Arguments:
@@ -30,6 +30,8 @@ class DRESTResource(object):
             id: resource ID. by default, assume no ID
             params: HTTP params
             data: HTTP data
+            stream: if set, return the unread response body
+                (mocked responses are still returned decoded)
         """
         name = self.name
         mocks = self._client.mocks.get(name)
@@ -37,6 +39,36 @@ class DRESTResource(object):
             return {name: mocks}
 
         return self._client.request(
+            method,
+            self._get_url(id),
+            params=params,
+            data=data,
+            stream=stream
+        )
+
+    def request_pages(self, pages, params=None):
+        """Perform GET requests for several pages of this resource.
+
+        Arguments:
+            pages: page numbers to fetch
+            params: HTTP params shared by every page
+        Returns:
+            List of responses, one per page.
+        """
+        params = params or {}
+        return self._client._parallel_get(
+            self._get_url(),
+            [dict(params, page=page) for page in pages]
+        )
+
+    async def arequest(self, method, id=None, params=None, data=None):
+        """Async version of request."""
+        name = self.name
+        mocks = self._client.mocks.get(name)
+        if method.lower() == 'get' and mocks:
+            return {name: mocks}
+
+        return await self._client.arequest(
             method,
             self._get_url(id),
             params=params,
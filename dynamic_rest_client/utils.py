@@ -3,6 +3,43 @@ def unpack(content):
         # empty values pass through
         return content
 
-    keys = [k for k in content.keys() if k != 'meta']
-    unpacked = content[keys[0]]
-    return unpacked
+    # responses are {<name>: data, 'meta': {...}}; take the first
+    # non-meta value without building a list of keys
+    for key in content:
+        if key != 'meta':
+            return content[key]
+
+
+def unpack_stream(body, meta):
+    """Incrementally parses a list response, yielding one item at a time.
+
+    Arguments:
+        body: file-like response body
+        meta: dict, filled with the response's "meta" once it is parsed
+    """
+    # ijson is optional and only needed here; import it on use
+    import ijson
+    from ijson.common import ObjectBuilder
+
+    item = None
+    builder = None
+    for prefix, event, value in ijson.parse(body, use_float=True):
+        if item is None:
+            if prefix == '' and event == 'map_key' and value != 'meta':
+                item = '%s.item' % value
+        elif prefix == item or prefix.startswith(item + '.'):
+            if builder is None:
+                builder = ObjectBuilder()
+            builder.event(event, value)
+            if prefix == item and event not in (
+                'start_map', 'start_array', 'map_key'
+            ):
+                # reached the end of an item
+                yield builder.value
+                builder = None
+            continue
+
+        if prefix.startswith('meta.') and event in (
+            'string', 'number', 'boolean', 'null'
+        ):
+            meta[prefix[len('meta.'):]] = value
@@ -1,19 +1,5 @@
-from setuptools import find_packages, setup
+from setuptools import setup
 
-NAME = 'dynamic-rest-client'
-DESCRIPTION = 'Python client for dynamic-rest with minimal dependencies'
-URL = 'http://github.com/AltSchool/dynamic-rest-client'
-VERSION = '0.2.0'
-SCRIPTS = []
-
-setup(
-    description=DESCRIPTION,
-    include_package_data=True,
-    install_requires=open('install_requires.txt').readlines(),
-    long_description=open('README.rst').read(),
-    name=NAME,
-    packages=find_packages(),
-    scripts=SCRIPTS,
-    url=URL,
-    version=VERSION
-)
+# metadata lives in pyproject.toml; this shim keeps `setup.py develop`
+# and `setup.py sdist` working for the Makefile
+setup()
@@ -1,12 +1,25 @@
+import asyncio
+import io
 import json
+import requests
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import skipIf
+from requests.adapters import BaseAdapter
 from rest_framework.test import APITestCase, APIClient
 from dynamic_rest_client import DRESTClient
+from dynamic_rest_client.client import _dumps, _flatten_params
 from dynamic_rest_client.exceptions import (
     BadRequest, DoesNotExist
 )
 from six import string_types
 from tests.setup import create_fixture
-from six.moves.urllib.parse import urlencode
+from six.moves.urllib.parse import parse_qsl, urlencode, urlsplit
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 
 class MockSession(object):
@@ -33,13 +46,105 @@ class MockSession(object):
             url,
             ('?%s' % make_params(params)) if params else ''
         )
-        if data and isinstance(data, string_types):
+        if data and isinstance(data, (bytes,) + string_types):
             data = json.loads(data)
-        response = getattr(self._client, method)(url, data=data)
-        content = response.content.decode('utf-8')
-        response.content = content
+        # like requests, leave response.content as raw bytes
+        return getattr(self._client, method)(url, data=data)
+
+
+def make_user_pages(total_pages):
+    """Builds canned responses for CannedSession: one user per page."""
+    def user(pk):
+        return {
+            'id': pk,
+            'name': str(pk),
+            '_meta': {'id': pk, 'type': 'users'}
+        }
+
+    responses = {
+        ('https://test/users', str(page)): {
+            'users': [user(page)],
+            'meta': {'page': page, 'total_pages': total_pages}
+        } for page in range(1, total_pages + 1)
+    }
+    responses[('https://test/users/1', None)] = {'user': user(1)}
+    return responses
+
+
+class CannedResponse(object):
+
+    def __init__(self, status_code, content):
+        self.status_code = status_code
+        self.content = content
+        self.raw = io.BytesIO(content)
+
+
+class CannedSession(object):
+
+    """requests.session compatibility adapter serving fixed responses.
+
+    Used where the test database cannot be reached, such as from
+    worker threads or inside an event loop.
+    Responses are keyed by URL and page number.
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.headers = {}
+        self.params = []
+
+    def request(self, method, url, params=None, data=None, stream=False):
+        self.params.append(params)
+        page = dict(params or {}).get('page')
+        key = (url, None if page is None else str(page))
+        if key not in self.responses:
+            return CannedResponse(404, b'Not found.')
+        return CannedResponse(
+            200, json.dumps(self.responses[key]).encode('utf-8')
+        )
+
+
+class LoginAdapter(BaseAdapter):
+
+    """requests adapter that records requests and sets a session cookie."""
+
+    def __init__(self):
+        super(LoginAdapter, self).__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.status_code = 200
+        response.request = request
+        response.url = request.url
+        response.cookies.set('sessionid', 'secret')
         return response
 
+    def close(self):
+        pass
+
+
+class CannedHandler(BaseHTTPRequestHandler):
+
+    """Serves a CannedSession's responses over HTTP."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        response = self.server.session.request(
+            'get', 'https://test%s' % url.path, params=parse_qsl(url.query)
+        )
+        self.send_response(response.status_code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    def log_message(self, *args):
+        pass
+
 
 class ClientTestCase(APITestCase):
 
@@ -146,8 +251,9 @@ class ClientTestCase(APITestCase):
             user.save()
 
     def test_get_invalid_data(self):
-        with self.assertRaises(DoesNotExist):
+        with self.assertRaises(DoesNotExist) as context:
             self.drest.Users.get('does-not-exist')
+        self.assertIsInstance(context.exception.args[0], string_types)
 
     def test_extra_pagination(self):
         users = list(self.drest.Users.all().extra(per_page=1))
@@ -182,6 +288,52 @@ class ClientTestCase(APITestCase):
             list(sorted(users, key=lambda x: x.name))
         )
 
+    def test_resource_cache(self):
+        self.assertIs(self.drest.Users, self.drest.users)
+        self.assertIsNot(self.drest.Users, self.drest.Groups)
+        with self.assertRaises(AttributeError):
+            self.drest._foo
+
+    def test_token_header(self):
+        drest = DRESTClient(
+            'test',
+            client=CannedSession({}),
+            authentication={'token': 'secret'}
+        )
+        self.assertTrue(drest.authenticated)
+        self.assertEqual(
+            drest._client.headers['Authorization'], b'JWT secret'
+        )
+
+    def test_login(self):
+        adapter = LoginAdapter()
+        session = requests.session()
+        session.mount('https://', adapter)
+        drest = DRESTClient(
+            'test',
+            client=session,
+            authentication={'username': 'user', 'password': 'pass'}
+        )
+        self.assertFalse(drest.authenticated)
+        drest._login()
+        self.assertTrue(drest.authenticated)
+
+        request = adapter.requests[0]
+        self.assertEqual(request.url, 'https://test/accounts/login/')
+        self.assertEqual(
+            request.headers['Content-Type'],
+            'application/x-www-form-urlencoded'
+        )
+        self.assertEqual(request.body, 'login=user&password=pass')
+
+    def test_parse_large_integers(self):
+        for pk in ('123456789012345678901234567890', '99999999999999999999'):
+            content = ('{"users": [{"id": %s}]}' % pk).encode('utf-8')
+            data = self.drest._handle_response(content, 200)
+            self.assertIsInstance(data, dict)
+            # kept exact, as the stdlib json parser would
+            self.assertEqual(data['users'][0]['id'], int(pk))
+
     def test_mocks(self):
         mock_users = [{
             'id': 1,
@@ -200,3 +352,83 @@ class ClientTestCase(APITestCase):
         except AttributeError:
             mus = [u for u in users]
         self.assertEqual(mus, mock_users)
+
+    def test_parallel_pages(self):
+        client = CannedSession(make_user_pages(5))
+        # pages 2-5 only return once all four are in flight at once
+        barrier = threading.Barrier(4, timeout=5)
+        request = client.request
+
+        def concurrent_request(method, url, params=None, **kwargs):
+            if params.get('page') != 1:
+                barrier.wait()
+            return request(method, url, params=params, **kwargs)
+
+        client.request = concurrent_request
+        drest = DRESTClient('test', client=client, workers=4)
+        # resources are still reachable by the name "workers"
+        self.assertEqual(drest.workers.name, 'workers')
+
+        users = drest.Users.all().list()
+        self.assertEqual([user.id for user in users], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            sorted(params['page'] for params in client.params),
+            [1, 2, 3, 4, 5]
+        )
+
+    def test_stream(self):
+        drest = DRESTClient('test', client=CannedSession(make_user_pages(3)))
+        users = list(drest.Users.stream())
+        self.assertEqual([user.id for user in users], [1, 2, 3])
+        self.assertEqual(users[2].name, '3')
+
+        with self.assertRaises(DoesNotExist):
+            list(drest.Foo.stream())
+
+    def test_dumps(self):
+        big = 123456789012345678901234567890
+        for data, expected in (
+            ({1: 'a', 'b': {2: None}}, {'1': 'a', 'b': {'2': None}}),
+            ({'id': big}, {'id': big}),
+        ):
+            self.assertEqual(json.loads(_dumps(data)), expected)
+
+    def test_flatten_params(self):
+        self.assertEqual(
+            _flatten_params({
+                'filter{parent}': None,
+                'include[]': ['a', None, 'b'],
+                'page': 2
+            }),
+            [('include[]', 'a'), ('include[]', 'b'), ('page', '2')]
+        )
+
+    @skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_async(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), CannedHandler)
+        server.session = CannedSession(make_user_pages(3))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        drest = DRESTClient(
+            '127.0.0.1:%d' % server.server_port,
+            client=MockSession(self.client),
+            scheme='http'
+        )
+        users = asyncio.run(drest.Users.including('location.*').aall())
+        self.assertEqual([user.id for user in users], [1, 2, 3])
+        self.assertEqual(users[1].name, '2')
+        self.assertIn(('include[]', 'location.*'), server.session.params[0])
+
+        # each asyncio.run has its own event loop, so the client's
+        # session must not outlive the first one
+        user = asyncio.run(drest.Users.aget(1))
+        self.assertEqual(user.name, '1')
+
+        async def get_missing():
+            async with drest:
+                return await drest.Users.aget(2)
+
+        with self.assertRaises(DoesNotExist):
+            asyncio.run(get_missing())